@@ -353,6 +353,8 @@ class Resource(object):
     name = None
     version = None
 
+    _schema_version = 0
+
 class ControllerMeta(type):
     def __new__(metatype, name, bases, namespace):
         controller = type.__new__(metatype, name, bases, namespace)
@@ -1,3 +1,9 @@
+import sys
+from bisect import insort
+from copy import copy
+from itertools import chain
+from weakref import WeakKeyDictionary
+
 from mesh.constants import *
 from mesh.exceptions import *
 from mesh.request import *
@@ -28,25 +34,60 @@ sortable (boolean)
     If True, this field can be specified as a sort parameter in query requests.
 """
 
+if sys.version_info >= (3, 0):
+    basestring = str
+    intern = sys.intern
+
+_clone_cache = WeakKeyDictionary()
+_filter_cache = WeakKeyDictionary()
+_operator_cache = WeakKeyDictionary()
+_partition_cache = WeakKeyDictionary()
+_response_partition_cache = WeakKeyDictionary()
+_returned_cache = {}
+_returning_cache = WeakKeyDictionary()
+_title_cache = WeakKeyDictionary()
+
+_OPERATOR_DESCRIPTIONS = {
+    'equal': 'Equals',
+    'iequal': 'Case-insensitive equals.',
+    'not': 'Not equal.',
+    'inot': 'Case-insensitive not equal.',
+    'prefix': 'Prefix search.',
+    'iprefix': 'Case-insensitive prefix search.',
+    'suffix': 'Suffix search.',
+    'isuffix': 'Case-insensitive suffix search.',
+    'contains': 'Contains.',
+    'icontains': 'Case-insensitive contains.',
+    'gt': 'Greater then.',
+    'gte': 'Greater then or equal to.',
+    'lt': 'Less then.',
+    'lte': 'Less then or equal to.',
+    'null': 'Is null.',
+    'in': 'In given values.',
+    'notin': 'Not in given values.',
+}
+
+_SORT_SUFFIXES = ('', '+', '-')
+
+_INVALID_RESPONSE = Response(Errors, INVALID)
+
+_LIMIT_FIELD = Integer(name='limit', minimum=0,
+    description='The maximum number of resources to return for this query.')
+_OFFSET_FIELD = Integer(name='offset', minimum=0, default=0,
+    description='The offset into the result set of this query.')
+_TOTAL_FIELD = Boolean(name='total', default=False, nonnull=True,
+    description='If true, only return the total for this query.')
+_TOTAL_COUNT_FIELD = Integer(name='total', nonnull=True, minimum=0,
+    description='The total number of resources in the result set for this query.')
+
 class OperatorConstructor(object):
-    operators = {
-        'equal': 'Equals',
-        'iequal': 'Case-insensitive equals.',
-        'not': 'Not equal.',
-        'inot': 'Case-insensitive not equal.',
-        'prefix': 'Prefix search.',
-        'iprefix': 'Case-insensitive prefix search.',
-        'suffix': 'Suffix search.',
-        'isuffix': 'Case-insensitive suffix search.',
-        'contains': 'Contains.',
-        'icontains': 'Case-insensitive contains.',
-        'gt': 'Greater then.',
-        'gte': 'Greater then or equal to.',
-        'lt': 'Less then.',
-        'lte': 'Less then or equal to.',
-        'null': 'Is null.',
-        'in': 'In given values.',
-        'notin': 'Not in given values.',
+    operators = _OPERATOR_DESCRIPTIONS
+
+    _DISPATCH = {
+        'equal': '_construct_equal_operator',
+        'in': '_construct_in_operator',
+        'notin': '_construct_notin_operator',
+        'null': '_construct_null_operator',
     }
 
     @classmethod
@@ -55,20 +96,45 @@ class OperatorConstructor(object):
         if isinstance(supported, basestring):
             supported = supported.split(' ')
 
+        cached = _operator_cache.get(field)
+        if cached is None:
+            cached = _operator_cache[field] = {}
+
+        key = (cls, field.name, tuple(supported))
+        constructed = cached.get(key)
+        if constructed is None:
+            constructed = cached[key] = cls._construct_operators(field, supported)
+
+        operators.update(constructed)
+        return operators
+
+    @classmethod
+    def _construct_operators(cls, field, supported):
+        descriptions = cls.operators
+        dispatch = dict((operator, getattr(cls, name))
+            for operator, name in cls._DISPATCH.items())
+
+        prototype = None
+        operators = {}
         for operator in supported:
             if isinstance(operator, Field):
                 operators[operator.name] = operator
                 continue
 
-            description = cls.operators.get(operator)
-            if description:
-                constructor = getattr(cls, '_construct_%s_operator' % operator, None)
-                if constructor:
-                    operator_field = constructor(field, description)
-                else:
-                    name = '%s__%s' % (field.name, operator)
-                    operator_field = clone_field(field, name, description)
-                operators[operator_field.name] = operator_field
+            description = descriptions.get(operator)
+            if not description:
+                continue
+
+            constructor = dispatch.get(operator)
+            if constructor:
+                operator_field = constructor(field, description)
+            else:
+                if prototype is None:
+                    prototype = clone_field(field)
+                operator_field = copy(prototype)
+                operator_field.name = '%s__%s' % (field.name, operator)
+                operator_field.description = description
+            operators[operator_field.name] = operator_field
 
         return operators
 
@@ -90,6 +156,7 @@ class OperatorConstructor(object):
     def _construct_null_operator(cls, field, description):
         return Boolean(name='%s__null' % field.name, description=description, nonnull=True)
 
+
 def add_query_operator(resource, operator):
     if 'query' in resource.requests:
         resource.requests['query'].schema.structure['query'].insert(operator)
@@ -104,61 +171,92 @@ def add_schema_field(resource, field):
 
     """
 
+    add_schema_fields(resource, [field])
 
-    resource.schema[field.name] = field
-    if 'get' in resource.requests:
-        request = resource.requests['get']
-        request.responses[OK].schema.insert(field)
+def add_schema_fields(resource, fields):
+    """Adds each of ``fields`` to the schema of ``resource``, updating all
+    requests to include them, where appropriate. Each affected request is
+    updated once for the entire batch.
 
-        request.schema.insert(construct_fields_field({field.name: field},
-            request.schema.get('fields')), overwrite=True)
+    :param resource: The :class:`mesh.resource.Resource` to modify.
 
-        if field.deferred:
-            request.schema.insert(construct_include_field({field.name: field},
-                request.schema.get('include')), overwrite=True)
-        else:
-            request.schema.insert(construct_exclude_field(resource.id_field, 
-                {field.name: field}, request.schema.get('exclude')), overwrite=True)
+    :param list fields: The :class:`scheme.fields.Field` instances to add.
 
-    if 'query' in resource.requests:
-        request = resource.requests['query']
-        request.responses[OK].schema.structure['resources'].item.insert(field)
+    """
 
-        request.schema.insert(construct_fields_field({field.name: field},
-            request.schema.get('fields')), overwrite=True)
+    fields = dict((_intern_token(field.name), field) for field in fields)
+    if not fields:
+        return
 
-        if field.deferred:
-            request.schema.insert(construct_include_field({field.name: field},
-                request.schema.get('include')), overwrite=True)
-        else:
-            request.schema.insert(construct_exclude_field(resource.id_field,
-                {field.name: field}, request.schema.get('exclude')), overwrite=True)
+    added_names = [name for name in fields if name not in resource.schema]
+    resource.schema.update(fields)
+    resource._schema_version += 1
+    _insert_schema_keys(resource, added_names)
 
-        if field.operators:
-            for operator in OperatorConstructor.construct({}, field).itervalues():
-                request.schema.structure['query'].insert(operator)
+    requests = resource.requests
+
+    if 'get' in requests:
+        request = requests['get']
+        _apply_fields_to_request(resource, request, fields, request.responses[OK].schema)
+
+    if 'query' in requests:
+        request = requests['query']
+        _apply_fields_to_request(resource, request, fields,
+            request.responses[OK].schema.structure['resources'].item)
+
+        operators = _construct_query_operators(fields, {})
+        if operators:
+            query = request.schema.structure.get('query')
+            if query:
+                for operator in operators.values():
+                    query.insert(operator)
+            else:
+                request.schema.structure['query'] = Structure(operators, name='query',
+                    description='The query to filter resources by.')
 
-        if field.sortable:
-            tokens = []
-            for suffix in ('', '+', '-'):
-                tokens.append(field.name + suffix)
+        tokens = _construct_sort_tokens(fields)
+
+        if tokens:
             sort = request.schema.structure.get('sort')
             if sort:
-                sort.item.redefine_enumeration(tokens)
+                enumeration = list(sort.item.enumeration)
+                for token in tokens:
+                    insort(enumeration, token)
+                sort.item.redefine_enumeration(enumeration)
             else:
                 request.schema.structure['sort'] = Sequence(
-                    Enumeration(sorted(tokens), nonnull=True),
+                    Enumeration(sorted(tokens), nonnull=True), name='sort',
                         description='The sort order for this query.')
 
-    if field.readonly:
-        return
+    create = requests.get('create')
+    update = requests.get('update')
+    put = requests.get('put')
+
+    for field in fields.values():
+        if field.readonly:
+            continue
+        if create and field.oncreate is not False:
+            create.schema.insert(field)
+        if update and field.onupdate is not False:
+            update.schema.insert(_clone_field(resource, field, False))
+        if put and field.onput is not False:
+            put.schema.insert(field)
+
+def _apply_fields_to_request(resource, request, fields, response_schema):
+    insert = response_schema.insert
+    for field in fields.values():
+        insert(field)
+
+    schema = request.schema
+    schema.insert(construct_fields_field(fields, schema.get('fields')), overwrite=True)
+
+    include_field = construct_include_field(fields, schema.get('include'))
+    if include_field:
+        schema.insert(include_field, overwrite=True)
 
-    if 'create' in resource.requests and field.oncreate is not False:
-        resource.requests['create'].schema.insert(field)
-    if 'update' in resource.requests and field.onupdate is not False:
-        resource.requests['update'].schema.insert(field.clone(required=False))
-    if 'put' in resource.requests and field.onput is not False:
-        resource.requests['put'].schema.insert(field)
+    exclude_field = construct_exclude_field(resource.id_field, fields, schema.get('exclude'))
+    if exclude_field:
+        schema.insert(exclude_field, overwrite=True)
 
 def clone_field(field, name=None, description=None):
     return field.clone(name=name, description=description, nonnull=True, default=None,
@@ -166,66 +264,219 @@ def clone_field(field, name=None, description=None):
         ignore_null=False, operators=None)
 
 def construct_fields_field(fields, original=None, field_name='fields'):
-    if original:
-        tokens = list(original.item.enumeration)
-    else:
-        tokens = []
-
-    tokens.extend(fields.keys())
-    return Sequence(Enumeration(sorted(tokens), nonnull=True), 
+    tokens = _merge_tokens(original, list(fields))
+    return Sequence(Enumeration(tokens, nonnull=True), 
         name=field_name, unique=True,
         description='The exact fields which should be returned for this query.')
 
 def construct_exclude_field(id_field, fields, original=None, field_name='exclude'):
-    if original:
-        tokens = list(original.item.enumeration)
-    else:
-        tokens = []
-
-    for name, field in fields.iteritems():
+    tokens = []
+    for name, field in fields.items():
         if name != id_field.name and not field.deferred:
             tokens.append(name)
 
+    if original and not tokens:
+        return original
+
+    tokens = _merge_tokens(original, tokens)
     if tokens:
-        return Sequence(Enumeration(sorted(tokens), nonnull=True), name=field_name,
+        return Sequence(Enumeration(tokens, nonnull=True), name=field_name,
             description='Fields which should not be returned for this query.')
 
 def construct_include_field(fields, original=None, field_name='include'):
-    if original:
-        tokens = list(original.item.enumeration)
-    else:
-        tokens = []
-
-    for name, field in fields.iteritems():
+    tokens = []
+    for name, field in fields.items():
         if field.deferred:
             tokens.append(name)
 
+    if original and not tokens:
+        return original
+
+    tokens = _merge_tokens(original, tokens)
     if tokens:
-        return Sequence(Enumeration(sorted(tokens), nonnull=True), name=field_name,
+        return Sequence(Enumeration(tokens, nonnull=True), name=field_name,
             description='Deferred fields which should be returned for this query.')
 
+def _merge_tokens(original, tokens):
+    """Merges ``tokens`` into the sorted enumeration of ``original``, a sequence field
+    previously constructed by this module, returning a sorted ``list``.
+
+    A single token, as contributed by :func:`add_schema_field`, is inserted in place
+    rather than resorting the entire enumeration; otherwise the enumeration and
+    ``tokens`` are sorted together into a single new list.
+    """
+
+    tokens = [_intern_token(token) for token in tokens]
+    if not original:
+        return sorted(tokens)
+
+    if len(tokens) == 1:
+        merged = list(original.item.enumeration)
+        insort(merged, tokens[0])
+        return merged
+    return sorted(chain(original.item.enumeration, tokens))
+
+def _construct_query_operators(fields, operators):
+    construct = OperatorConstructor.construct
+    for field in fields.values():
+        if field.operators:
+            construct(operators, field)
+    return operators
+
+def _construct_sort_tokens(fields):
+    sortable_names = [name for name, field in fields.items() if field.sortable]
+
+    tokens = []
+    for suffix in _SORT_SUFFIXES:
+        tokens.extend(_intern_token(name + suffix) for name in sortable_names)
+    return tokens
+
+def _intern_token(token):
+    # intern() only accepts byte strings under python 2
+    if type(token) is str:
+        return intern(token)
+    return token
+
 def construct_returning(resource):
-    return Sequence(Enumeration(sorted(resource.schema.keys()), nonnull=True))
+    tokens = _get_cached(_returning_cache, resource, _sort_schema_keys)
+    return Sequence(Enumeration(list(tokens), nonnull=True))
 
 def filter_schema_for_response(resource):
+    return dict(_get_cached(_filter_cache, resource, _filter_schema_for_response))
+
+def _filter_schema_for_response(resource):
     id_field = resource.id_field
     schema = {}
-    for name, field in resource.filter_schema(exclusive=False, readonly=True).iteritems():
+    for name, field in resource.filter_schema(exclusive=False, readonly=True).items():
         if name == id_field.name:
-            schema[name] = field.clone(required=True)
+            schema[name] = _clone_field(resource, field, True)
         elif field.required:
-            schema[name] = field.clone(required=False)
+            schema[name] = _clone_field(resource, field, False)
         else:
             schema[name] = field
     return schema
 
+def _clone_field(resource, field, required=None):
+    """Returns a clone of ``field`` with the specified value for ``required``, or an
+    unmodified clone if ``required`` is ``None``, shared by every request constructed
+    for ``resource`` until its schema is next modified."""
+
+    clones = _get_cached(_clone_cache, resource, _construct_cache)
+    key = (id(field), required)
+
+    entry = clones.get(key)
+    if entry is None or entry[0] is not field:
+        if required is None:
+            clone = field.clone()
+        else:
+            clone = field.clone(required=required)
+        entry = clones[key] = (field, clone)
+    return entry[1]
+
+def _construct_cache(resource):
+    return {}
+
+def _get_cached(cache, resource, constructor):
+    """Returns the value ``constructor`` derives from the schema of ``resource``,
+    reusing the value held in ``cache`` until the schema is next modified."""
+
+    version = resource._schema_version
+    entry = cache.get(resource)
+    if entry is None or entry[0] != version:
+        entry = cache[resource] = (version, constructor(resource))
+    return entry[1]
+
+def _partition_schema(resource):
+    """Partitions the schema of ``resource`` for the construction of its standard
+    requests, returning a tuple containing the writable fields and the identifier
+    fields."""
+
+    return _get_cached(_partition_cache, resource, _construct_partition)
+
+def _construct_partition(resource):
+    writable_fields = resource.filter_schema(exclusive=False, readonly=False)
+
+    identifier_fields = {}
+    for name, field in resource.schema.items():
+        if field.is_identifier:
+            identifier_fields[name] = field
+
+    return writable_fields, identifier_fields
+
+def _partition_response(resource, request):
+    """Returns a tuple containing the names of the fields always returned in the
+    response to ``request`` and the names of those returned only when requested
+    through ``returning``."""
+
+    partitions = _get_cached(_response_partition_cache, resource, _construct_cache)
+    partition = partitions.get(request)
+    if partition is None:
+        identifier_fields = _partition_schema(resource)[1]
+        required, optional = [], []
+        for name, field in resource.schema.items():
+            if name in identifier_fields or is_returned(field, request):
+                required.append(name)
+            else:
+                optional.append(name)
+        partition = partitions[request] = (tuple(required), tuple(optional))
+    return partition
+
+def _construct_response_schema(resource, request, support_returning):
+    required, optional = _partition_response(resource, request)
+    schema = resource.schema
+
+    response_schema = dict((name, _clone_field(resource, schema[name], True))
+        for name in required)
+    if support_returning:
+        response_schema.update((name, _clone_field(resource, schema[name], False))
+            for name in optional)
+    return response_schema
+
+def _insert_schema_keys(resource, names):
+    """Carries the sorted schema keys of ``resource`` forward to its new schema version,
+    inserting ``names`` in place, provided they were current for the prior version."""
+
+    entry = _returning_cache.get(resource)
+    if entry is not None and entry[0] == resource._schema_version - 1:
+        keys = entry[1]
+        for name in names:
+            insort(keys, name)
+        _returning_cache[resource] = (resource._schema_version, keys)
+
+def _sort_schema_keys(resource):
+    return sorted(resource.schema)
+
+def _get_titles(resource):
+    titles = _title_cache.get(resource)
+    if titles is None:
+        title = resource.title.lower()
+        titles = _title_cache[resource] = (title, pluralize(title))
+    return titles
+
+def _plural_title(resource):
+    return _get_titles(resource)[1]
+
+def _title(resource):
+    return _get_titles(resource)[0]
+
 def is_returned(field, request):
     returned = field.returned
     if not returned:
         return False
+    return (request in _parse_returned(returned))
+
+def _parse_returned(returned):
     if isinstance(returned, basestring):
-        returned = returned.split(' ')
-    return (request in returned)
+        key = returned
+    else:
+        key = tuple(returned)
+
+    parsed = _returned_cache.get(key)
+    if parsed is None:
+        if isinstance(returned, basestring):
+            returned = returned.split(' ')
+        parsed = _returned_cache[key] = frozenset(returned)
+    return parsed
 
 def is_returning_supported(resource, declaration):
     supported = False
@@ -239,12 +490,9 @@ def construct_query_request(resource, declaration=None):
     fields = filter_schema_for_response(resource)
     schema = {
         'fields': construct_fields_field(fields),
-        'limit': Integer(minimum=0,
-            description='The maximum number of resources to return for this query.'),
-        'offset': Integer(minimum=0, default=0,
-            description='The offset into the result set of this query.'),
-        'total': Boolean(default=False, nonnull=True,
-            description='If true, only return the total for this query.'),
+        'limit': _LIMIT_FIELD,
+        'offset': _OFFSET_FIELD,
+        'total': _TOTAL_FIELD,
     }
 
     include_field = construct_include_field(fields)
@@ -255,20 +503,13 @@ def construct_query_request(resource, declaration=None):
     if exclude_field:
         schema['exclude'] = exclude_field
 
-    tokens = []
-    for name, field in fields.iteritems():
-        if field.sortable:
-            for suffix in ('', '+', '-'):
-                tokens.append(name + suffix)
+    tokens = _construct_sort_tokens(fields)
 
     if tokens:
         schema['sort'] = Sequence(Enumeration(sorted(tokens), nonnull=True),
             description='The sort order for this query.')
 
-    operators = {}
-    for name, field in fields.iteritems():
-        if field.operators:
-            OperatorConstructor.construct(operators, field)
+    operators = _construct_query_operators(fields, {})
 
     if declaration:
         additions = getattr(declaration, 'operators', None)
@@ -280,8 +521,7 @@ def construct_query_request(resource, declaration=None):
             description='The query to filter resources by.')
 
     response_schema = Structure({
-        'total': Integer(nonnull=True, minimum=0,
-            description='The total number of resources in the result set for this query.'),
+        'total': _TOTAL_COUNT_FIELD,
         'resources': Sequence(Structure(fields), nonnull=True),
     })
 
@@ -289,7 +529,7 @@ def construct_query_request(resource, declaration=None):
     if declaration:
         valid_responses = getattr(declaration, 'valid_responses', valid_responses)
 
-    responses = {INVALID: Response(Errors)}
+    responses = {INVALID: _INVALID_RESPONSE}
     for response_code in valid_responses:
         responses[response_code] = Response(response_schema)
 
@@ -298,7 +538,7 @@ def construct_query_request(resource, declaration=None):
         endpoint = (GET, resource.name),
         auto_constructed = True,
         resource = resource,
-        title = 'Querying %s' % pluralize(resource.title.lower()),
+        title = 'Querying %s' % _plural_title(resource),
         schema = Structure(schema),
         responses = responses,
     )
@@ -322,44 +562,41 @@ def construct_get_request(resource, declaration=None):
         specific = True,
         auto_constructed = True,
         resource = resource,
-        title = 'Getting a specific %s' % resource.title.lower(),
-        schema = schema and Structure(schema) or None,
+        title = 'Getting a specific %s' % _title(resource),
+        schema = Structure(schema) if schema else None,
         responses = {
             OK: Response(response_schema),
-            INVALID: Response(Errors),
+            INVALID: _INVALID_RESPONSE,
         }
     )
 
 def construct_create_request(resource, declaration=None):
+    writable_fields, identifier_fields = _partition_schema(resource)
+    support_returning = is_returning_supported(resource, declaration)
+
     resource_schema = {}
-    for name, field in resource.filter_schema(exclusive=False, readonly=False).iteritems():
-        if field.is_identifier:
+    for name, field in writable_fields.items():
+        if name in identifier_fields:
             if field.oncreate is True:
                 resource_schema[name] = field.clone(ignore_null=True)
         elif field.oncreate is not False:
             resource_schema[name] = field
 
-    support_returning = is_returning_supported(resource, declaration)
     if support_returning:
         resource_schema[RETURNING] = construct_returning(resource)
 
-    response_schema = {}
-    for name, field in resource.schema.iteritems():
-        if field.is_identifier or is_returned(field, 'create'):
-            response_schema[name] = field.clone(required=True)
-        elif support_returning:
-            response_schema[name] = field.clone(required=False)
-    
+    response_schema = _construct_response_schema(resource, 'create', support_returning)
+
     return Request(
         name = 'create',
         endpoint = (POST, resource.name),
         auto_constructed = True,
         resource = resource,
-        title = 'Creating a new %s' % resource.title.lower(),
+        title = 'Creating a new %s' % _title(resource),
         schema = Structure(resource_schema, name='resource'),
         responses = {
             OK: Response(Structure(response_schema)),
-            INVALID: Response(Errors),
+            INVALID: _INVALID_RESPONSE,
         }
     )
 
@@ -369,7 +606,7 @@ def construct_load_request(resource, declaration=None):
 
     schema = {
         'fields': construct_fields_field(fields),
-        'identifiers': Sequence(resource.id_field.clone(), nonempty=True),
+        'identifiers': Sequence(_clone_field(resource, resource.id_field), nonempty=True),
     }
 
     include_field = construct_include_field(fields)
@@ -381,30 +618,27 @@ def construct_load_request(resource, declaration=None):
         endpoint = (LOAD, resource.name),
         auto_constructed = True,
         resource = resource,
-        title = 'Loading %s' % pluralize(resource.title.lower()),
+        title = 'Loading %s' % _plural_title(resource),
         schema = Structure(schema),
         responses = {
             OK: Response(response_schema),
-            INVALID: Response(Errors),
+            INVALID: _INVALID_RESPONSE,
         }
     )
 
 def construct_put_request(resource, declaration=None):
+    writable_fields, identifier_fields = _partition_schema(resource)
+    support_returning = is_returning_supported(resource, declaration)
+
     resource_schema = {}
-    for name, field in resource.filter_schema(exclusive=False, readonly=False).iteritems():
-        if not field.is_identifier and field.onput is not False:
+    for name, field in writable_fields.items():
+        if name not in identifier_fields and field.onput is not False:
             resource_schema[name] = field
 
-    support_returning = is_returning_supported(resource, declaration)
     if support_returning:
         resource_schema[RETURNING] = construct_returning(resource)
 
-    response_schema = {}
-    for name, field in resource.schema.iteritems():
-        if field.is_identifier or is_returned(field, 'put'):
-            response_schema[name] = field.clone(required=True)
-        elif support_returning:
-            response_schema[name] = field.clone(required=False)
+    response_schema = _construct_response_schema(resource, 'put', support_returning)
 
     return Request(
         name = 'put',
@@ -413,38 +647,35 @@ def construct_put_request(resource, declaration=None):
         auto_constructed = True,
         subject_required = False,
         resource = resource,
-        title = 'Putting a specific %s' % resource.title.lower(),
+        title = 'Putting a specific %s' % _title(resource),
         schema = Structure(resource_schema),
         responses = {
             OK: Response(Structure(response_schema)),
-            INVALID: Response(Errors),
+            INVALID: _INVALID_RESPONSE,
         }
     )
 
 def construct_update_request(resource, declaration=None):
+    writable_fields, identifier_fields = _partition_schema(resource)
+    support_returning = is_returning_supported(resource, declaration)
+
     resource_schema = {}
-    for name, field in resource.filter_schema(exclusive=False, readonly=False).iteritems():
-        if not field.is_identifier and field.onupdate is not False:
+    for name, field in writable_fields.items():
+        if name not in identifier_fields and field.onupdate is not False:
             if field.required:
-                field = field.clone(required=False)
+                field = _clone_field(resource, field, False)
             resource_schema[name] = field
 
-    support_returning = is_returning_supported(resource, declaration)
     if support_returning:
         resource_schema[RETURNING] = construct_returning(resource)
 
-    response_schema = {}
-    for name, field in resource.schema.iteritems():
-        if field.is_identifier or is_returned(field, 'update'):
-            response_schema[name] = field.clone(required=True)
-        elif support_returning:
-            response_schema[name] = field.clone(required=False)
+    response_schema = _construct_response_schema(resource, 'update', support_returning)
 
     valid_responses = [OK]
     if declaration:
         valid_responses = getattr(declaration, 'valid_responses', valid_responses)
 
-    responses = {INVALID: Response(Errors)}
+    responses = {INVALID: _INVALID_RESPONSE}
     for response_code in valid_responses:
         responses[response_code] = Response(Structure(response_schema))
 
@@ -454,21 +685,23 @@ def construct_update_request(resource, declaration=None):
         specific = True,
         auto_constructed = True,
         resource = resource,
-        title = 'Updating a specific %s' % resource.title.lower(),
+        title = 'Updating a specific %s' % _title(resource),
         schema = Structure(resource_schema),
         responses = responses,
     )
 
 def construct_create_update_request(resource, declaration=None):
+    writable_fields = _partition_schema(resource)[0]
+
     schema = {}
-    for name, field in resource.filter_schema(exclusive=False, readonly=False).iteritems():
+    for name, field in writable_fields.items():
         if field.required:
-            field = field.clone(required=False)
+            field = _clone_field(resource, field, False)
         schema[name] = field
 
     schema = Sequence(Structure(schema))
     response_schema = Sequence(Structure({
-        resource.id_field.name: resource.id_field.clone(required=True),
+        resource.id_field.name: _clone_field(resource, resource.id_field, True),
     }))
 
     return Request(
@@ -477,25 +710,25 @@ def construct_create_update_request(resource, declaration=None):
         specific = False,
         auto_constructed = True,
         resource = resource,
-        title = 'Creating and updating multiple %s' % pluralize(resource.title.lower()),
+        title = 'Creating and updating multiple %s' % _plural_title(resource),
         schema = schema,
         responses = {
             OK: Response(response_schema),
-            INVALID: Response(Errors),
+            INVALID: _INVALID_RESPONSE,
         }
     )
 
 def construct_delete_request(resource, declaration=None):
     id_field = resource.id_field
     response_schema = Structure({
-        id_field.name: id_field.clone(required=True)
+        id_field.name: _clone_field(resource, id_field, True)
     })
 
     valid_responses = [OK]
     if declaration:
         valid_responses = getattr(declaration, 'valid_responses', valid_responses)
 
-    responses = {INVALID: Response(Errors)}
+    responses = {INVALID: _INVALID_RESPONSE}
     for response_code in valid_responses:
         responses[response_code] = Response(response_schema)
 
@@ -505,7 +738,7 @@ def construct_delete_request(resource, declaration=None):
         specific = True,
         auto_constructed = True,
         resource = resource,
-        title = 'Deleting a specific %s' % resource.title.lower(),
+        title = 'Deleting a specific %s' % _title(resource),
         schema = None,
         responses = responses,
     )
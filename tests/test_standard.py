@@ -2,6 +2,8 @@ from datetime import date, time
 from unittest2 import TestCase
 
 from mesh.standard import *
+from mesh.standard.requests import OperatorConstructor, add_schema_field, \
+    add_schema_fields, construct_returning, filter_schema_for_response
 from mesh.transport.internal import *
 
 from fixtures import *
@@ -111,3 +113,112 @@ class TestStandardResources(TestCase):
         response = server.dispatch(endpoint('get'), {}, id, {'exclude': ['default_field']})
         self.assertEqual(response.status, OK)
         self.assertEqual(response.content, {'id': id, 'required_field': 'text'})
+
+class TestStandardRequestConstruction(TestCase):
+    def construct_resource(self):
+        class Sample(Resource):
+            name = 'sample'
+            version = 1
+            requests = 'create get put query update'
+
+            class schema:
+                text_field = Text(sortable=True, operators='equal in')
+                integer_field = Integer(required=True)
+
+        return Sample
+
+    def test_filtered_schema_follows_added_fields(self):
+        Sample = self.construct_resource()
+        fields = filter_schema_for_response(Sample)
+        self.assertEqual(set(fields.keys()), set(['id', 'text_field', 'integer_field']))
+
+        fields['ignored'] = Text()
+        self.assertNotIn('ignored', filter_schema_for_response(Sample))
+
+        returning = construct_returning(Sample)
+        self.assertEqual(returning.item.enumeration, ['id', 'integer_field', 'text_field'])
+
+        add_schema_field(Sample, Boolean(name='boolean_field'))
+        fields = filter_schema_for_response(Sample)
+        self.assertIn('boolean_field', fields)
+
+        returning = construct_returning(Sample)
+        self.assertEqual(returning.item.enumeration,
+            ['boolean_field', 'id', 'integer_field', 'text_field'])
+
+    def test_added_fields_remain_sorted(self):
+        Sample = self.construct_resource()
+        add_schema_field(Sample, Text(name='another_field'))
+        add_schema_field(Sample, Text(name='deferred_field', deferred=True))
+
+        schema = Sample.requests['query'].schema
+        self.assertEqual(schema.structure['fields'].item.enumeration,
+            ['another_field', 'deferred_field', 'id', 'integer_field', 'text_field'])
+        self.assertEqual(schema.structure['exclude'].item.enumeration,
+            ['another_field', 'integer_field', 'text_field'])
+        self.assertEqual(schema.structure['include'].item.enumeration, ['deferred_field'])
+
+    def test_adding_multiple_fields(self):
+        Sample = self.construct_resource()
+        add_schema_fields(Sample, [
+            Text(name='first_field', sortable=True, operators='equal'),
+            Integer(name='second_field', sortable=True, readonly=True),
+        ])
+
+        schema = Sample.requests['query'].schema
+        self.assertEqual(schema.structure['sort'].item.enumeration,
+            ['first_field', 'first_field+', 'first_field-', 'second_field',
+            'second_field+', 'second_field-', 'text_field', 'text_field+', 'text_field-'])
+        self.assertIn('first_field', schema.structure['query'].structure)
+        self.assertIn('second_field', Sample.requests['get'].responses[OK].schema.structure)
+
+        create_schema = Sample.requests['create'].schema.structure
+        self.assertIn('first_field', create_schema)
+        self.assertNotIn('second_field', create_schema)
+
+    def test_query_operators(self):
+        class Operated(Resource):
+            name = 'operated'
+            version = 1
+            requests = 'query'
+
+            class schema:
+                text_field = Text(operators='equal prefix suffix in notin null eq ne')
+
+        query = Operated.requests['query'].schema.structure['query'].structure
+        self.assertEqual(set(query.keys()), set(['text_field', 'text_field__prefix',
+            'text_field__suffix', 'text_field__in', 'text_field__notin', 'text_field__null']))
+
+        self.assertEqual(query['text_field'].description, 'Equals')
+        self.assertIsInstance(query['text_field__in'], Sequence)
+        self.assertIsInstance(query['text_field__notin'], Sequence)
+        self.assertIsInstance(query['text_field__null'], Boolean)
+
+        prefix, suffix = query['text_field__prefix'], query['text_field__suffix']
+        self.assertIsNot(prefix, suffix)
+        self.assertIsInstance(prefix, Text)
+        self.assertEqual(prefix.name, 'text_field__prefix')
+        self.assertEqual(prefix.description, 'Prefix search.')
+        self.assertEqual(suffix.name, 'text_field__suffix')
+        self.assertEqual(suffix.description, 'Suffix search.')
+
+    def test_operator_constructor_overrides(self):
+        class CustomConstructor(OperatorConstructor):
+            @classmethod
+            def _construct_null_operator(cls, field, description):
+                return Text(name='%s__null' % field.name, description='Custom.')
+
+        operators = CustomConstructor.construct({}, Text(name='t', operators='null'))
+        self.assertIsInstance(operators['t__null'], Text)
+        self.assertEqual(operators['t__null'].description, 'Custom.')
+
+        operators = OperatorConstructor.construct({}, Text(name='t', operators='null'))
+        self.assertIsInstance(operators['t__null'], Boolean)
+
+    def test_operator_constructor_additions(self):
+        class ExtendedConstructor(OperatorConstructor):
+            operators = dict(OperatorConstructor.operators, regex='Regex.')
+
+        operators = ExtendedConstructor.construct({}, Text(name='t', operators='regex eq'))
+        self.assertEqual(list(operators.keys()), ['t__regex'])
+        self.assertEqual(operators['t__regex'].description, 'Regex.')